@@ -1,98 +1,558 @@
+import io
 import os
 import sys
 import json
+import mmap
+import time
+import random
 import argparse
 import logging
-from io import BytesIO
+import threading
+from urllib.parse import quote, urlsplit
+from concurrent.futures import ThreadPoolExecutor
 
+import psutil
 import requests
+import urllib3
 from dotenv import load_dotenv
 from tqdm import tqdm
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
+from urllib3.util.retry import Retry
 
 
 # --- Constants ---
-BLOCK_SIZE = 4096  # Chunk size for downloading files
+BLOCK_SIZE = 1 << 20  # Chunk size for downloading files (1 MiB)
+CONNECTIONS = 8  # Number of parallel range requests per download
+POOL_SIZE = 16  # Number of connections kept open per host
+MAX_RETRIES = 8  # Number of consecutive failed attempts before a download is given up
+MAX_BACKOFF = 30  # Maximum number of seconds to wait between two attempts
+BREAKER_THRESHOLD = 5  # Number of failed attempts at a host tolerated within BREAKER_WINDOW
+BREAKER_WINDOW = 30  # Number of seconds in which failures to a host are counted together
+BREAKER_COOLDOWN = 60  # Number of seconds requests to a failing host are refused before trying again
+PROGRESS_STEP = 1 << 20  # Number of bytes transferred between two progress bar updates
+MAX_RAM = 2 << 30  # Largest file downloaded to RAM, larger files are streamed (2 GiB)
+MAX_PARALLEL_SOURCES = 8  # Number of sources transferred at the same time
+MAX_POOLED_BUFFERS = 2  # Number of download buffers mapped at once, bounding the memory held by downloads
 
 # --- Logging Configuration ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 
+# --- HTTP Session ---
+class BlockSizeHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter whose connections send streamed request bodies in large blocks
+    instead of urllib3's default 16 KiB, cutting the Python work per uploaded byte.
+    The pools of urllib3 1.x do not accept a block size, they keep the default.
+    """
+
+    supports_blocksize = int(urllib3.__version__.split('.')[0]) >= 2
+
+    def __init__(self, *args, blocksize: int = BLOCK_SIZE, **kwargs):
+        self.blocksize = blocksize  # Must be set before HTTPAdapter.__init__ creates the pool manager
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **pool_kwargs):
+        if self.supports_blocksize:
+            pool_kwargs['blocksize'] = self.blocksize
+        super().init_poolmanager(*args, **pool_kwargs)
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        if self.supports_blocksize:
+            proxy_kwargs['blocksize'] = self.blocksize
+        return super().proxy_manager_for(proxy, **proxy_kwargs)
+
+
+def create_session() -> requests.Session:
+    """
+    Creates a session that keeps connections open between requests and retries
+    failed connections and temporary server errors.
+
+    Returns:
+        requests.Session: The configured session.
+    """
+    session = requests.Session()
+    adapter = BlockSizeHTTPAdapter(
+        pool_connections=POOL_SIZE,
+        pool_maxsize=POOL_SIZE,
+        max_retries=Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[502, 503, 504],
+            allowed_methods=['GET', 'HEAD', 'PUT', 'POST'],
+        ),
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+# Shared by all requests so that TCP and TLS handshakes are only done once per host
+SESSION = create_session()
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request to a host that keeps failing."""
+
+
+class CircuitBreaker:
+    """
+    Counts failed attempts per host. Once more than failure_threshold of them happen within
+    failure_window seconds, the circuit opens: requests to the host fail fast for cooldown
+    seconds. After that the circuit is half-open, a single trial request is let through that
+    closes the circuit again on success and reopens it on failure.
+
+    The failures of one attempt at a URL count once, so that the parallel range workers
+    of a single download failing together do not open the circuit on their own.
+    """
+
+    def __init__(self, failure_threshold: int = BREAKER_THRESHOLD, failure_window: float = BREAKER_WINDOW,
+                 cooldown: float = BREAKER_COOLDOWN):
+        self.failure_threshold = failure_threshold
+        self.failure_window = failure_window
+        self.cooldown = cooldown
+        self._failures = {}  # Failed (url, attempt) pairs per host
+        self._first_failure = {}  # Time of the first of these failures per host
+        self._opened_at = {}  # Time the circuit was opened per host
+        self._trial_started = {}  # Time the trial request of a half-open circuit was let through per host
+        self._lock = threading.Lock()
+
+    def check(self, url: str):
+        """
+        Raises CircuitOpenError if the circuit for the host of a URL is open,
+        or half-open with its trial request still in progress.
+
+        Args:
+            url (str): The URL about to be requested.
+        """
+        host = urlsplit(url).netloc
+        now = time.monotonic()
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return
+            remaining = self.cooldown - (now - opened_at)
+            if remaining > 0:
+                raise CircuitOpenError(f'Too many failed requests to {host}, not retrying for {remaining:.0f}s')
+            # A trial that never reported back does not block the host for longer than a cooldown
+            trial_started = self._trial_started.get(host)
+            if trial_started is not None and now - trial_started < self.cooldown:
+                raise CircuitOpenError(f'Too many failed requests to {host}, waiting for a trial request')
+            self._trial_started[host] = now
+
+    def record_success(self, url: str):
+        """
+        Closes the circuit for the host of a URL and forgets its failures.
+
+        Args:
+            url (str): The URL that was requested successfully.
+        """
+        host = urlsplit(url).netloc
+        with self._lock:
+            self._failures.pop(host, None)
+            self._first_failure.pop(host, None)
+            self._opened_at.pop(host, None)
+            self._trial_started.pop(host, None)
+
+    def record_failure(self, url: str, attempt: int):
+        """
+        Counts a failed attempt at a URL against its host, opening the circuit if the host
+        failed too often or if this was the trial request of a half-open circuit.
+
+        Args:
+            url (str): The URL that failed.
+            attempt (int): The number of the attempt, counting from 0 since the last success.
+        """
+        host = urlsplit(url).netloc
+        now = time.monotonic()
+        with self._lock:
+            if now - self._first_failure.get(host, now) > self.failure_window:
+                self._failures.pop(host, None)  # The earlier failures are too old to count
+            if host not in self._failures:
+                self._first_failure[host] = now
+                self._failures[host] = set()
+            self._failures[host].add((url, attempt))
+
+            if len(self._failures[host]) > self.failure_threshold or host in self._trial_started:
+                self._opened_at[host] = now
+                self._trial_started.pop(host, None)
+
+
+BREAKER = CircuitBreaker()
+
+
+# --- Buffer Pool ---
+class BufferPool:
+    """
+    Keeps download buffers around after use, so that consecutive downloads reuse them
+    instead of mapping and unmapping fresh memory each time. At most max_buffers are
+    mapped at once, which also bounds the RAM held by parallel downloads.
+
+    Buffers are anonymous memory maps, which are unmapped and returned to the OS as soon as
+    they are closed, rather than whenever the last reference to them happens to be collected.
+    """
+
+    def __init__(self, max_buffers: int = MAX_POOLED_BUFFERS):
+        self.max_buffers = max_buffers
+        self._free = []
+        self._in_use = 0
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_buffers)
+
+    def reserve(self, blocking: bool = True) -> bool:
+        """
+        Takes a slot for one buffer, to be filled by acquire() or given back by cancel().
+        Waits while max_buffers slots are taken.
+
+        Args:
+            blocking (bool): Whether to wait for a slot, or to give up at once if none is free.
+
+        Returns:
+            bool: Whether a slot was taken.
+        """
+        return self._slots.acquire(blocking)
+
+    def cancel(self):
+        """
+        Gives back a slot taken by reserve() without acquiring a buffer for it.
+        """
+        self._slots.release()
+
+    def acquire(self, size: int) -> mmap.mmap:
+        """
+        Takes the smallest free buffer of at least size bytes from the pool, or maps a new one,
+        for a slot taken by reserve(). The slot stays taken if this raises.
+
+        Args:
+            size (int): The minimum size of the buffer in bytes.
+
+        Returns:
+            mmap.mmap: The buffer, which may be larger than requested.
+        """
+        with self._lock:
+            self._in_use += 1
+        try:
+            with self._lock:
+                fitting = [buffer for buffer in self._free if len(buffer) >= size]
+                if fitting:
+                    buffer = min(fitting, key=len)
+                    self._free.remove(buffer)
+                    return buffer
+                # None of the free buffers is large enough, unmap one to make room for the new buffer
+                if self._free and self._in_use + len(self._free) > self.max_buffers:
+                    self._discard(self._free.pop())
+            return mmap.mmap(-1, max(size, 1))  # Zero bytes cannot be mapped
+        except Exception:
+            with self._lock:
+                self._in_use -= 1
+            raise
+
+    @staticmethod
+    def _discard(buffer: mmap.mmap):
+        try:
+            buffer.close()
+        except BufferError:
+            pass  # A view of the buffer still exists, it is unmapped once that view is garbage collected
+
+    def release(self, buffer_view: memoryview, reuse: bool = True):
+        """
+        Releases a view returned by download_to_ram and hands its buffer back to the pool.
+
+        Args:
+            buffer_view (memoryview): The view over the buffer.
+            reuse (bool): Whether the buffer may be handed out again. Pass False when other views
+                of it may still be alive, e.g. in the traceback of a failed download.
+        """
+        buffer = buffer_view.obj
+        buffer_view.release()
+        with self._lock:
+            self._in_use -= 1
+            if reuse:
+                self._free.append(buffer)
+            else:
+                self._discard(buffer)
+        self._slots.release()
+
+
+BUFFER_POOL = BufferPool()
+
+
 # --- File Operations ---
-def download_to_ram(url: str) -> tuple:
+def get_file_name(headers: dict) -> str:
+    """
+    Determines the file name from the Content-Disposition header of a response.
+
+    Args:
+        headers (dict): The response headers.
+
+    Returns:
+        str: The file name, or 'Unnamed' if the server did not provide one.
+    """
+    content_disposition = headers.get('Content-Disposition', None)
+    if content_disposition and 'filename=' in content_disposition:
+        return content_disposition.split('filename=')[1].strip('"')
+    return 'Unnamed'
+
+
+class ProgressReader:
+    """
+    File-like wrapper around a stream that updates a progress bar as it is read,
+    so that the stream can be passed directly as a request body.
+    """
+
+    def __init__(self, stream, size: int, bar: tqdm, block_size: int = BLOCK_SIZE):
+        self.stream = stream
+        self.len = size  # Read by requests to set the Content-Length, 0 means chunked transfer encoding
+        self.bar = bar
+        self.block_size = block_size
+        self.position = 0
+        self.reported = 0  # Position last shown on the progress bar
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.stream.read(size if size >= 0 else None)
+        self.position += len(data)
+        if not data or self.position - self.reported >= PROGRESS_STEP:
+            self.bar.update(self.position - self.reported)
+            self.reported = self.position
+        return data
+
+    def __iter__(self):
+        while data := self.read(self.block_size):
+            yield data
+
+    def tell(self) -> int:
+        return self.position
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        # Lets urllib3 rewind a seekable stream for a retry, a non-seekable one makes it refuse to retry instead
+        if not (hasattr(self.stream, 'seekable') and self.stream.seekable()):
+            raise io.UnsupportedOperation('The underlying stream is not seekable')
+        self.position = self.stream.seek(offset, whence)
+        self.bar.update(self.position - self.reported)  # Negative when rewinding
+        self.reported = self.position
+        return self.position
+
+
+class BufferWriter:
+    """
+    Fills a preallocated buffer sequentially from streams and updates a progress bar.
+    """
+
+    def __init__(self, buffer_view: memoryview, position: int, bar: tqdm):
+        self.buffer_view = buffer_view
+        self.position = position
+        self.bar = bar
+        self.reported = position  # Position last shown on the progress bar
+
+    def fill(self, stream, block_size: int):
+        """
+        Reads a stream straight into the buffer, one block at a time, until the stream
+        or the buffer ends. No intermediate bytes object is handed around per block.
+
+        Args:
+            stream: A stream supporting readinto().
+            block_size (int): Number of bytes read per iteration.
+        """
+        while read_size := stream.readinto(self.buffer_view[self.position:self.position + block_size]):
+            self.position += read_size
+            if self.position - self.reported >= PROGRESS_STEP:
+                self.flush()
+
+    def seek(self, position: int):
+        self.position = position
+        self.flush()
+
+    def flush(self):
+        self.bar.update(self.position - self.reported)
+        self.reported = self.position
+
+
+class RangeNotSupportedError(Exception):
+    """Raised when a server answers a range request with the entire file."""
+
+
+class RamLimitError(Exception):
+    """Raised when a file is too large, or of unknown size, to be downloaded to RAM."""
+
+
+def download_range(url: str, buffer_view: memoryview, start: int, end: int,
+                   block_size: int, bar: tqdm, response: requests.Response = None):
+    """
+    Downloads the byte range [start, end) of a URL into the matching slice of a buffer,
+    resuming from the last received byte when the connection drops.
+
+    Args:
+        url (str): The URL of the file to download.
+        buffer_view (memoryview): A view over the buffer holding the entire file.
+        start (int): The first byte of the range.
+        end (int): The byte after the last byte of the range.
+        block_size (int): Number of bytes read from the socket per iteration.
+        bar (tqdm): The progress bar to update.
+        response (requests.Response): An already open response for the entire file to read from first.
+    """
+    # Bound the writer to this range, so that a server sending too much cannot overwrite the next one
+    writer = BufferWriter(buffer_view[:end], start, bar)
+    attempt = 0
+
+    while writer.position < end:
+        resumed_at = writer.position
+        try:
+            if response is None:
+                BREAKER.check(url)  # Fail fast instead of requesting from a host that keeps failing
+                headers = {'Range': f'bytes={writer.position}-{end - 1}', 'Accept-Encoding': 'identity'}
+                response = SESSION.get(url, headers=headers, stream=True, timeout=60)
+                response.raise_for_status()  # Raise an exception for HTTP errors
+
+            if response.status_code != 206:  # Not Partial Content, the body is the entire file
+                # A full body can only be used when this range covers the entire file
+                if start != 0 or end != len(buffer_view):
+                    response.close()
+                    raise RangeNotSupportedError(f'Status code: {response.status_code}')
+                if writer.position:
+                    logger.error(f'Server did not support range requests. Status code: {response.status_code}')
+                    # Fallback for servers not supporting range requests: start over
+                    writer.seek(0)
+
+            response.raw.decode_content = True
+            writer.fill(response.raw, block_size)
+            if writer.position == resumed_at:  # Neither an error nor data, e.g. an empty 206 response
+                raise urllib3.exceptions.ProtocolError('Response ended without any data')
+            BREAKER.record_success(url)
+
+        except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError) as e:
+            if writer.position > resumed_at:
+                attempt = 0
+                BREAKER.record_success(url)
+            BREAKER.record_failure(url, attempt)
+            if attempt >= MAX_RETRIES:
+                raise
+            # Back off exponentially, with jitter so that parallel workers do not retry in lockstep
+            delay = min(MAX_BACKOFF, 0.5 * 2 ** attempt) + random.uniform(0, 0.5)
+            attempt += 1
+            logger.error(f'Error occurred during download: {e}. Retrying in {delay:.1f}s...')
+            time.sleep(delay)
+        finally:
+            writer.flush()
+            response = None
+
+
+def download_to_ram(url: str, block_size: int = BLOCK_SIZE, connections: int = CONNECTIONS,
+                    max_ram: int = MAX_RAM) -> tuple:
     """
-    Downloads a file from a given URL directly into RAM using BytesIO.
+    Downloads a file from a given URL directly into a preallocated buffer in RAM,
+    using several range requests in parallel when the server supports them.
 
     Args:
         url (str): The URL of the file to download.
+        block_size (int): Number of bytes read from the socket per iteration.
+        connections (int): Maximum number of parallel range requests.
+        max_ram (int): Maximum size in bytes of a file downloaded to RAM.
 
     Returns:
-        tuple: (default_file_name, file_in_ram)
+        tuple: (default_file_name, file_in_ram) where file_in_ram is a memoryview over a buffer
+        from BUFFER_POOL. Hand it back with BUFFER_POOL.release() once uploaded.
+
+    Raises:
+        RamLimitError: If the size of the file is unknown or compressed, above max_ram,
+            or above half of the memory currently available.
     """
     logger.info('Starting file download to RAM.')
-    
-    # Initial HEAD request to get file metadata
-    response = requests.head(url)
+
+    # The first request both returns the file metadata and starts the download.
+    # The buffer is sized from the Content-Length, so the body must not be compressed.
+    BREAKER.check(url)
+    try:
+        response = SESSION.get(url, headers={'Accept-Encoding': 'identity'}, stream=True, timeout=60)
+        response.raise_for_status()  # Raise an exception for HTTP errors
+    except requests.exceptions.RequestException:
+        BREAKER.record_failure(url, 0)
+        raise
+    BREAKER.record_success(url)
     logger.debug(f'Response headers: {response.headers}')
 
     total_size = int(response.headers.get('content-length', 0))
-    content_disposition = response.headers.get('Content-Disposition', None)
-    
-    # Determine filename from Content-Disposition header or default to 'Unnamed'
-    if content_disposition:
-        default_file_name = content_disposition.split('filename=')[1].strip('"')
-    else:
-        default_file_name = 'Unnamed'
+    accepts_ranges = response.headers.get('Accept-Ranges', 'none').lower() == 'bytes'
+    default_file_name = get_file_name(response.headers)
+
+    if response.headers.get('Content-Encoding', 'identity') != 'identity':
+        response.close()
+        raise RamLimitError('File size is unknown, the server compressed the response')
+
+    if not 0 < total_size <= max_ram:
+        response.close()
+        raise RamLimitError(f'File size {total_size} is unknown or above the limit of {max_ram} bytes')
 
-    file_in_ram = BytesIO()
-    downloaded_size = 0
+    if not BUFFER_POOL.reserve(blocking=False):
+        # Do not hold an unread response open while other downloads finish with their buffers
+        response.close()
+        response = None
+        BUFFER_POOL.reserve()
+
+    try:
+        # Refuse sizes that would exhaust memory or push the system into swap, rather than trusting the server.
+        # Only checked once the slot is held, as the downloads holding the other slots use up memory meanwhile.
+        available_ram = psutil.virtual_memory().available // 2
+        if total_size > available_ram:
+            raise RamLimitError(f'File size {total_size} is above the limit of {available_ram} bytes of available memory')
+
+        # Preallocate the whole file once and fill it in place, instead of letting BytesIO grow by copying
+        buffer_view = memoryview(BUFFER_POOL.acquire(total_size))[:total_size]
+    except Exception:
+        BUFFER_POOL.cancel()
+        if response is not None:
+            response.close()
+        raise
+
+    # Split the file into one range per connection, each at least one block long
+    part_count = max(1, min(connections, -(-total_size // block_size))) if accepts_ranges else 1
+    part_size = max(1, -(-total_size // part_count))
+    ranges = [(start, min(start + part_size, total_size)) for start in range(0, total_size, part_size)]
+
+    # Keep reading the body of the first request, unless the file is split into several ranges
+    if len(ranges) != 1 and response is not None:
+        response.close()
+        response = None
 
     # Download the file in chunks with a progress bar
-    while downloaded_size < total_size:
+    failed = False
+    with tqdm(total=total_size, unit='iB', unit_scale=True, unit_divisor=1024, desc=f"Downloading {default_file_name}") as bar:
         try:
-            headers = {'Range': f'bytes={downloaded_size}-{total_size}'}
-            response = requests.get(url, headers=headers, stream=True, timeout=60)
-            response.raise_for_status()  # Raise an exception for HTTP errors
+            if len(ranges) > 1:
+                try:
+                    with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+                        futures = [executor.submit(download_range, url, buffer_view, start, end, block_size, bar)
+                                   for start, end in ranges]
+                        for future in futures:
+                            future.result()
+                except RangeNotSupportedError as e:
+                    logger.error(f'Server did not support parallel range requests ({e}). Downloading serially.')
+                    bar.reset()
+                    ranges = [(0, total_size)]
+
+            if len(ranges) == 1:
+                download_range(url, buffer_view, 0, total_size, block_size, bar, response)
 
-            if response.status_code == 206:  # Partial Content
-                with tqdm(total=total_size, initial=downloaded_size, unit='iB', unit_scale=True, unit_divisor=1024, desc=f"Downloading {default_file_name}") as bar:
-                    for data in response.iter_content(BLOCK_SIZE):
-                        file_in_ram.write(data)
-                        downloaded_size += len(data)
-                        bar.update(len(data))
-            else:
-                logger.error(f'Server did not support range requests. Status code: {response.status_code}')
-                # Fallback for servers not supporting range requests: download entire file
-                file_in_ram.seek(0) # Reset BytesIO if partial download occurred
-                file_in_ram.truncate(0)
-                response = requests.get(url, stream=True, timeout=60)
-                response.raise_for_status()
-                with tqdm(total=total_size, unit='iB', unit_scale=True, unit_divisor=1024, desc=f"Downloading {default_file_name}") as bar:
-                    for data in response.iter_content(BLOCK_SIZE):
-                        file_in_ram.write(data)
-                        downloaded_size += len(data)
-                        bar.update(len(data))
-                break # Exit loop after full download
-
-        except requests.exceptions.RequestException as e:
-            logger.error(f'Error occurred during download: {e}. Retrying...')
-            continue
         except Exception as e:
             logger.error(f'An unexpected error occurred: {e}')
-            sys.exit(1)
+            failed = True  # Exit outside of the handler, so the traceback does not keep views of the buffer alive
+
+    if failed:
+        # Give the buffer back, or parallel downloads would wait for it forever
+        BUFFER_POOL.release(buffer_view, reuse=False)
+        sys.exit(1)
 
-    file_in_ram.seek(0)  # Move cursor to the beginning for subsequent reads
     logger.info("File download complete.")
-    return default_file_name, file_in_ram
+    return default_file_name, buffer_view
 
 
-def upload_from_ram(file_in_ram: BytesIO, file_name: str, username: str, apikey: str) -> dict:
+def upload_from_ram(file_in_ram: memoryview, file_name: str, username: str, apikey: str) -> dict:
     """
     Uploads a file from RAM to Pixeldrain.
 
     Args:
-        file_in_ram (BytesIO): The BytesIO object containing the file content.
+        file_in_ram (memoryview): The buffer containing the file content.
         file_name (str): The name of the file to upload.
         username (str): Pixeldrain username.
         apikey (str): Pixeldrain API key.
@@ -102,16 +562,73 @@ def upload_from_ram(file_in_ram: BytesIO, file_name: str, username: str, apikey:
     """
     logger.info(f'Starting upload of file: {file_name}')
     
-    response = requests.post(
-        'https://pixeldrain.com/api/file',
-        auth=HTTPBasicAuth(username, apikey),
-        headers={'name': file_name},
-        files={'file': (file_name, file_in_ram)},
-    )
+    # Send the buffer as the raw request body, a multipart body would copy it once more.
+    # The view is sent without copying and released afterwards, so the buffer can be closed.
+    with memoryview(file_in_ram) as body:
+        response = SESSION.put(
+            f'https://pixeldrain.com/api/file/{quote(file_name, safe="")}',
+            auth=HTTPBasicAuth(username, apikey),
+            headers={'Content-Type': 'application/octet-stream'},
+            data=body,
+        )
     response.raise_for_status()  # Raise an exception for HTTP errors
     logger.debug(response.text)
     logger.info('File upload complete.')
-    return response.json()
+
+    result = response.json()
+    result.setdefault('success', True)  # The PUT endpoint only answers with the file ID
+    return result
+
+
+def download_and_upload_stream(url: str, file_name: str, username: str, apikey: str,
+                               block_size: int = BLOCK_SIZE) -> dict:
+    """
+    Pipes a file from a given URL straight into an upload to Pixeldrain,
+    without holding more than one block of it in RAM.
+
+    Args:
+        url (str): The URL of the file to download.
+        file_name (str): The name of the file to upload, or None to use the name given by the server.
+        username (str): Pixeldrain username.
+        apikey (str): Pixeldrain API key.
+        block_size (int): Number of bytes read from the socket per iteration.
+
+    Returns:
+        dict: The JSON response from the Pixeldrain API.
+    """
+    logger.info('Starting streamed transfer.')
+
+    download = SESSION.get(url, stream=True, timeout=60)
+    download.raise_for_status()  # Raise an exception for HTTP errors
+    logger.debug(f'Response headers: {download.headers}')
+
+    file_name = file_name or get_file_name(download.headers)
+    download.raw.decode_content = True
+    # The length of a compressed body says nothing about the decoded size
+    if download.headers.get('Content-Encoding', 'identity') == 'identity':
+        total_size = int(download.headers.get('content-length', 0))
+    else:
+        total_size = 0
+
+    with tqdm(total=total_size or None, unit='iB', unit_scale=True, unit_divisor=1024, desc=f"Transferring {file_name}") as bar:
+        reader = ProgressReader(download.raw, total_size, bar, block_size)
+        try:
+            response = SESSION.put(
+                f'https://pixeldrain.com/api/file/{quote(file_name, safe="")}',
+                auth=HTTPBasicAuth(username, apikey),
+                headers={'Content-Type': 'application/octet-stream'},
+                # Without a known length the body is sent with chunked transfer encoding
+                data=reader,
+            )
+        finally:
+            download.close()
+    response.raise_for_status()  # Raise an exception for HTTP errors
+    logger.debug(response.text)
+    logger.info('Streamed transfer complete.')
+
+    result = response.json()
+    result.setdefault('success', True)  # The PUT endpoint only answers with the file ID
+    return result
 
 
 def upload_local_file(file_path: str, file_name: str, username: str, apikey: str) -> dict:
@@ -131,13 +648,15 @@ def upload_local_file(file_path: str, file_name: str, username: str, apikey: str
 
     try:
         with open(file_path, 'rb') as local_file_obj:
-            
-            response = requests.post(
-                'https://pixeldrain.com/api/file',
-                auth=HTTPBasicAuth(username, apikey),
-                headers={'name': file_name},
-                files={'file': (file_name, local_file_obj)},
-            )
+            total_size = os.fstat(local_file_obj.fileno()).st_size
+            with tqdm(total=total_size, unit='iB', unit_scale=True, unit_divisor=1024, desc=f"Uploading {file_name}") as bar:
+                # Send the file as the raw request body, read and sent one block at a time without multipart framing
+                response = SESSION.put(
+                    f'https://pixeldrain.com/api/file/{quote(file_name, safe="")}',
+                    auth=HTTPBasicAuth(username, apikey),
+                    headers={'Content-Type': 'application/octet-stream'},
+                    data=ProgressReader(local_file_obj, total_size, bar),
+                )
             response.raise_for_status()  # Raise an exception for HTTP errors
             logger.debug(response.text)
 
@@ -149,10 +668,18 @@ def upload_local_file(file_path: str, file_name: str, username: str, apikey: str
         sys.exit(1)
 
     logger.info('Local file upload complete.')
-    return response.json()
+
+    result = response.json()
+    result.setdefault('success', True)  # The PUT endpoint only answers with the file ID
+    return result
 
 
 # --- Credential Management ---
+# Credentials from the environment or the .env file, read once at startup
+ENV_USERNAME = None
+ENV_APIKEY = None
+
+
 def get_upload_properties(args: argparse.Namespace, default_file_name: str) -> tuple:
     """
     Retrieves username, API key, and filename for upload.
@@ -165,15 +692,13 @@ def get_upload_properties(args: argparse.Namespace, default_file_name: str) -> t
     Returns:
         tuple: (filename, username, apikey)
     """
-    load_dotenv()  # Load environment variables from .env file
-
     username = args.username
     apikey = args.apikey
 
     # Check for credentials from .env if not provided via command line
     if not username and not apikey:
-        username = os.getenv('username')
-        apikey = os.getenv('apikey')
+        username = ENV_USERNAME
+        apikey = ENV_APIKEY
         if not username or not apikey:
             logger.error("Error: Pixeldrain username and API key not found. Please provide them via command-line arguments or in a .env file.")
             sys.exit(1)
@@ -205,12 +730,15 @@ def store_credentials(username: str, apikey: str):
 
 
 # --- Output and Main Execution ---
-def display_upload_result(result: dict):
+def display_upload_result(result: dict) -> bool:
     """
     Displays the upload result links or an error message.
 
     Args:
         result (dict): The JSON response from the Pixeldrain API.
+
+    Returns:
+        bool: Whether the upload was successful.
     """
     if result.get('success'):
         file_id = result['id']
@@ -225,10 +753,79 @@ f"""
 |    https://pd.cybar.xyz/{file_id}                               |
 + -------------------------------------------------------------- +
 """)
+        return True
+
+    logger.error(f"Upload failed: {result.get('message', 'Unknown error')}")
+    return False
 
+
+def process_source(source: str, args: argparse.Namespace) -> tuple:
+    """
+    Uploads a single source to Pixeldrain, downloading it first if it is a URL.
+
+    Args:
+        source (str): The URL of the file to download from, or the path to a local file to upload.
+        args (argparse.Namespace): Command-line arguments.
+
+    Returns:
+        tuple: (upload_result, username, apikey)
+    """
+    # Check if the source is a URL
+    # Todo: Check whether a account is valid before upload 
+    if source.startswith(('http://', 'https://')) and args.stream:
+        # Get upload properties (filename, username, apikey), the server names the file if no name was given
+        filename, username, apikey = get_upload_properties(args, None)
+
+        # Pipe the download into the upload
+        upload_result = download_and_upload_stream(source, filename, username, apikey, args.block_size)
+    elif source.startswith(('http://', 'https://')):
+        try:
+            # Download file to RAM
+            default_file_name, file_in_ram = download_to_ram(source, args.block_size, args.connections, args.max_ram)
+        except RamLimitError as e:
+            logger.warning(f'{e}. Streaming the file instead.')
+
+            # Get upload properties (filename, username, apikey), the server names the file if no name was given
+            filename, username, apikey = get_upload_properties(args, None)
+
+            # Pipe the download into the upload
+            upload_result = download_and_upload_stream(source, filename, username, apikey, args.block_size)
+        else:
+            try:
+                # Get upload properties (filename, username, apikey)
+                filename, username, apikey = get_upload_properties(args, default_file_name)
+
+                # Upload file from RAM
+                upload_result = upload_from_ram(file_in_ram, filename, username, apikey)
+            finally:
+                # Keep the buffer for the next download, also when the upload failed
+                BUFFER_POOL.release(file_in_ram)
     else:
-        logger.error(f"Upload failed: {result.get('message', 'Unknown error')}")
-        sys.exit(1)
+        # Assume it's a local file path
+ 
+        # Get upload properties (filename, username, apikey)
+        filename, username, apikey = get_upload_properties(args, os.path.basename(source)) 
+
+        # Upload local file
+        upload_result = upload_local_file(source, filename, username, apikey)
+
+    return upload_result, username, apikey
+
+
+def positive_int(value: str) -> int:
+    """
+    Argument type for options that only make sense with a positive number.
+
+    Args:
+        value (str): The value given on the command line.
+
+    Returns:
+        int: The value as an integer.
+    """
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f'{value} is not a positive integer')
+    return number
 
 
 def main():
@@ -239,48 +836,56 @@ def main():
     parser = argparse.ArgumentParser(
         description='A tool to upload files to Pixeldrain from a URL or local disk.'
     )
-    parser.add_argument('source', type=str,
-                        help='The URL of the file to download from, or the path to a local file to upload.')
+    parser.add_argument('source', type=str, nargs='+',
+                        help='The URLs of the files to download from, or the paths to local files to upload.')
     parser.add_argument('-n', '--name', type=str, help='The name for the file you want to store on Pixeldrain.')
     parser.add_argument('-u', '--username', type=str, help='The username of the Pixeldrain account.')
     parser.add_argument('-k', '--apikey', type=str, help='The API key of the Pixeldrain account.')
     parser.add_argument('-s', '--store-credential', action='store_true',
                         help='Store the username and API key in a .env file for future use. '
                              'Previous stored keys will be overwritten.')
+    parser.add_argument('-b', '--block-size', type=positive_int, default=BLOCK_SIZE,
+                        help=f'Number of bytes read per iteration while downloading (default: {BLOCK_SIZE}).')
+    parser.add_argument('--stream', action='store_true',
+                        help='Pipe a URL source straight into the upload instead of downloading it to RAM first.')
+    parser.add_argument('-c', '--connections', type=positive_int, default=CONNECTIONS,
+                        help=f'Number of parallel connections used to download from a URL (default: {CONNECTIONS}).')
+    parser.add_argument('-m', '--max-ram', type=positive_int, default=MAX_RAM,
+                        help=f'Largest file in bytes downloaded to RAM, larger files are streamed (default: {MAX_RAM}).')
     args = parser.parse_args()
 
-    upload_result = None
-    filename = None
-    
-    # Check if the source is a URL
-    # Todo: Check whether a account is valid before upload 
-    # Todo: Check whether there is enough RAM before downloading
-    if args.source.startswith(('http://', 'https://')):
-        # Download file to RAM
-        default_file_name, file_in_ram = download_to_ram(args.source)
+    if args.name and len(args.source) > 1:
+        logger.error('Error: A name can only be given when uploading a single source.')
+        sys.exit(1)
 
-        # Get upload properties (filename, username, apikey)
-        filename, username, apikey = get_upload_properties(args, default_file_name)
+    # Transfer the sources in parallel, each with its own progress bar
+    with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_SOURCES, len(args.source))) as executor:
+        futures = [(source, executor.submit(process_source, source, args)) for source in args.source]
 
-        # Upload file from RAM
-        upload_result = upload_from_ram(file_in_ram, filename, username, apikey)
-    else:
-        # Assume it's a local file path
- 
-        # Get upload properties (filename, username, apikey)
-        filename, username, apikey = get_upload_properties(args, os.path.basename(args.source)) 
+    # Display the result of every source, a failed one does not hide the others
+    succeeded = []
+    for source, future in futures:
+        try:
+            upload_result, username, apikey = future.result()
+        except SystemExit:
+            continue  # The error has already been logged
+        except Exception as e:
+            logger.error(f"Error transferring '{source}': {e}")
+            continue
 
-        # Upload local file
-        upload_result = upload_local_file(args.source, filename, username, apikey)
+        if display_upload_result(upload_result):
+            succeeded.append((username, apikey))
 
-    if upload_result:
-        # Display upload result
-        display_upload_result(upload_result)
- 
-        # Store credentials if requested and upload was successful
-        if args.store_credential and upload_result.get('success'):
-            store_credentials(username, apikey)
+    if len(succeeded) < len(futures):
+        sys.exit(1)
+
+    # Store credentials if requested and every upload was successful
+    if args.store_credential:
+        store_credentials(*succeeded[-1])
 
 
 if __name__ == "__main__":
+    load_dotenv()  # Load environment variables from .env file
+    ENV_USERNAME = os.environ.get('username')
+    ENV_APIKEY = os.environ.get('apikey')
     main()